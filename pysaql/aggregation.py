@@ -52,6 +52,7 @@ class WindowFunction(Function):
         self._row_range = row_range
         self._reset_groups = reset_groups
         self._order_by = [order_by] if isinstance(order_by, Scalar) else order_by
+        self._changed()
         return self
 
     def to_string(self) -> str:
@@ -325,8 +325,8 @@ class date_range(Expression):
 
         """
         if isinstance(self.start_date, date) and isinstance(self.end_date, date):
-            start = ",".join(str(arg) for arg in self.start_date._args)
-            end = ",".join(str(arg) for arg in self.end_date._args)
+            start = ",".join([str(arg) for arg in self.start_date._args])
+            end = ",".join([str(arg) for arg in self.end_date._args])
             return f"[dateRange([{start}], [{end}])]"
         else:
             start = str(self.start_date) if self.start_date else ""
@@ -2,10 +2,15 @@
 
 
 from abc import ABC, abstractmethod
+import copy
 from typing import Optional
 
 from .util import escape_identifier
 
+# Bumped whenever an expression that has already been rendered is changed in place.
+# Cached statement and stream strings are only reused while this is unchanged.
+render_version = 0
+
 
 class Expression(ABC):
     """Base expression class
@@ -14,7 +19,16 @@ class Expression(ABC):
     provide common methods.
     """
 
-    _alias: Optional[str] = None
+    __slots__ = ("_alias", "_cached_str")
+
+    _alias: Optional[str]
+    _cached_str: Optional[str]
+
+    def __init__(self) -> None:
+        """Initializer"""
+        super().__init__()
+        self._alias = None
+        self._cached_str = None
 
     def alias(self, name: str) -> "Expression":
         """Set the alias name
@@ -27,13 +41,52 @@ class Expression(ABC):
 
         """
         self._alias = name
+        self._changed()
         return self
 
+    def with_alias(self, name: str) -> "Expression":
+        """Create a copy of the expression with an alias
+
+        Unlike `alias`, this leaves the original expression untouched, so the same
+        expression can be shared between statements under different aliases.
+
+        Args:
+            name: Alias name
+
+        Returns:
+            new expression object with alias
+
+        """
+        expr = copy.copy(self)
+        expr._alias = name
+        expr._cached_str = None
+        return expr
+
+    def _changed(self) -> None:
+        """Discard the cached string after the expression is changed in place"""
+        global render_version
+        if self._cached_str is not None:
+            self._cached_str = None
+            render_version += 1
+
     @abstractmethod
     def to_string(self) -> str:
         """Cast the expression to a string"""
         pass
 
+    def is_static(self) -> bool:
+        """Whether the expression always renders to the same string
+
+        Static expressions have their string representation cached after the first
+        cast. Subclasses should only return True when none of their inputs can change
+        after construction.
+
+        Returns:
+            True if the rendered string can be cached
+
+        """
+        return False
+
     def __str__(self) -> str:
         """Cast the expression to a string, including the alias if set
 
@@ -41,8 +94,14 @@ class Expression(ABC):
             string
 
         """
+        if self._cached_str is not None:
+            return self._cached_str
+
         s = self.to_string()
         if self._alias:
             s += f" as {escape_identifier(self._alias)}"
 
+        if self.is_static():
+            self._cached_str = s
+
         return s
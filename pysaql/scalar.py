@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from abc import ABC
 import operator
+import sys
 from typing import Any, Callable, Optional, Protocol, Sequence, Union
 
 from .expression import Expression
@@ -31,10 +32,35 @@ OPERATOR_STRINGS = {
     operator.truediv: "/",
 }
 
+# Literal types whose stringified value cannot change after construction. Subclasses
+# are not included since they may override how the value is stringified.
+STATIC_LITERAL_TYPES = frozenset([str, int, float, bool, type(None)])
+
+
+def is_static(obj: Any) -> bool:
+    """Check whether an operand always renders to the same string
+
+    Args:
+        obj: Expression or literal operand
+
+    Returns:
+        True if the operand is a static expression or an immutable literal
+
+    """
+    if type(obj) in STATIC_LITERAL_TYPES:
+        return True
+    # Expressions are duck-typed to avoid the cost of an ABC instance check
+    try:
+        return obj.is_static()
+    except AttributeError:
+        return False
+
 
 class BooleanOperation(Expression):
     """Mixin that defines boolean comparison methods"""
 
+    __slots__ = ()
+
     def __and__(self, obj: Any) -> BinaryOperation:
         """Creates a binary operation using the `and` operator
 
@@ -72,6 +98,8 @@ class BooleanOperation(Expression):
 class Scalar(BooleanOperation, ABC):
     """Represents a scalar expression"""
 
+    __slots__ = ()
+
     def __eq__(self, obj: Any) -> BinaryOperation:  # type: ignore[override]
         """Creates a binary operation using the `eq` or `is` operator
 
@@ -219,6 +247,8 @@ class Scalar(BooleanOperation, ABC):
 class BinaryOperation(Scalar):
     """Represents a binary operation"""
 
+    __slots__ = ("op", "left", "right", "_wrap")
+
     def __init__(self, op: Callable, left: Any, right: Any, wrap: bool = False) -> None:
         """Initializer
 
@@ -237,11 +267,26 @@ class BinaryOperation(Scalar):
         self.op = op
         self.left = left
         self.right = right
-        self.wrap = wrap
+        self._wrap = wrap
         for operand in (self.left, self.right):
             if isinstance(operand, BinaryOperation):
                 operand.wrap = True
 
+    @property
+    def wrap(self) -> bool:
+        """Flag that indicates whether the operation is wrapped in parentheses"""
+        return self._wrap
+
+    @wrap.setter
+    def wrap(self, value: bool) -> None:
+        """Set the wrap flag, discarding any cached string"""
+        self._wrap = value
+        self._changed()
+
+    def is_static(self) -> bool:
+        """Whether the binary operation always renders to the same string"""
+        return is_static(self.left) and is_static(self.right)
+
     def to_string(self) -> str:
         """Cast the binary operation to a string"""
         s = f"{stringify(self.left)} {OPERATOR_STRINGS[self.op]} {stringify(self.right)}"
@@ -251,9 +296,57 @@ class BinaryOperation(Scalar):
         return s
 
 
+class Conjunction(Scalar):
+    """Represents two or more operands combined with the `and` operator
+
+    This renders the same string as folding the operands into nested binary
+    operations from the left, but without building the intermediate operations.
+    """
+
+    __slots__ = ("operands",)
+
+    def __init__(self, operands: Sequence[Any]) -> None:
+        """Initializer
+
+        Args:
+            operands: One or more operands to combine
+
+        """
+        super().__init__()
+        if not operands:
+            raise ValueError("At least one operand is required")
+        self.operands = operands
+        if len(self.operands) > 1:
+            for operand in self.operands:
+                if isinstance(operand, BinaryOperation):
+                    operand.wrap = True
+
+    def is_static(self) -> bool:
+        """Whether the conjunction always renders to the same string"""
+        return all(is_static(operand) for operand in self.operands)
+
+    def to_string(self) -> str:
+        """Cast the conjunction to a string"""
+        n = len(self.operands)
+        if n == 1:
+            return stringify(self.operands[0])
+
+        op = f" {OPERATOR_STRINGS[operator.and_]} "
+        buf = ["(" * (n - 2), stringify(self.operands[0])]
+        for i in range(1, n):
+            buf.append(op)
+            buf.append(stringify(self.operands[i]))
+            if i < n - 1:
+                buf.append(")")
+
+        return "".join(buf)
+
+
 class UnaryOperation(Scalar):
     """Represents a unary operation"""
 
+    __slots__ = ("op", "value")
+
     def __init__(self, op: Callable, value: Any) -> None:
         """Initializer
 
@@ -266,6 +359,10 @@ class UnaryOperation(Scalar):
         self.op = op
         self.value = value
 
+    def is_static(self) -> bool:
+        """Whether the unary operation always renders to the same string"""
+        return is_static(self.value)
+
     def to_string(self) -> str:
         """Cast the unary operation to a string"""
         return f"{OPERATOR_STRINGS[self.op]} {stringify(self.value)}"
@@ -286,6 +383,8 @@ class StreamProtocol(Protocol):
 class field(Scalar):
     """Represents a field (column) in the data stream"""
 
+    __slots__ = ("name", "stream")
+
     def __init__(self, name: str, stream: Optional[StreamProtocol] = None) -> None:
         """Represents a field (column) in the data stream
 
@@ -297,9 +396,17 @@ class field(Scalar):
 
         """
         super().__init__()
-        self.name = name
+        self.name = sys.intern(name) if type(name) is str else name
         self.stream = stream
 
+    def is_static(self) -> bool:
+        """Whether the field always renders to the same string
+
+        Fields scoped to a stream are not static because the stream reference may be
+        renumbered when the stream is combined with others.
+        """
+        return self.stream is None
+
     def to_string(self) -> str:
         """Cast the field to a string"""
         prefix = f"{self.stream.ref}." if self.stream else ""
@@ -309,6 +416,8 @@ class field(Scalar):
 class literal(Scalar):
     """Represents a literal value"""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: Any) -> None:
         """Represents a literal value
 
@@ -319,6 +428,10 @@ class literal(Scalar):
         super().__init__()
         self.value = value
 
+    def is_static(self) -> bool:
+        """Whether the literal always renders to the same string"""
+        return type(self.value) in STATIC_LITERAL_TYPES
+
     def to_string(self) -> str:
         """Cast the literal to a string"""
         return stringify(self.value)
@@ -2,17 +2,33 @@
 
 from __future__ import annotations
 
-from abc import ABC
-import functools
-import operator
-from typing import List, Optional, Sequence, Tuple, Union
+from abc import ABC, abstractmethod
+import sys
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
+from . import expression
 from .enums import FillDateTypeString, JoinType, Order
-from .scalar import BinaryOperation, field, Scalar
+from .scalar import BinaryOperation, Conjunction, field, is_static, Scalar
 from .util import flatten, stringify, stringify_list
 
 __ALL__ = ["load", "cogroup"]
 
+# SAQL keyword fragments shared by statement renderers
+_LOAD = ' = load "'
+_FOREACH = " = foreach "
+_GENERATE = " generate "
+_FILTER = " = filter "
+_ORDER = " = order "
+_LIMIT = " = limit "
+_GROUP = " = group "
+_COGROUP = " = cogroup "
+_UNION = " = union "
+_FILL = " = fill "
+_BY = " by "
+_COMMA = ", "
+_SEMI = ";"
+_NL = "\n"
+
 
 class StreamStatement(ABC):
     """Base class for a stream SAQL statement
@@ -20,8 +36,29 @@ class StreamStatement(ABC):
     Each SAQL statement has an input stream, an operation, and an output stream.
     """
 
+    __slots__ = (
+        "stream",
+        "_cacheable",
+        "_cached_key",
+        "_cached_version",
+        "_cached_str",
+    )
+
     stream: "Stream"
 
+    _cacheable: bool
+    _cached_key: Any
+    _cached_version: int
+    _cached_str: str
+
+    def __init__(self) -> None:
+        """Initializer"""
+        super().__init__()
+        self._cacheable = True
+        self._cached_key = None
+        self._cached_version = -1
+        self._cached_str = ""
+
     def get_streams(self) -> list[Stream]:
         """Get a flat list of streams nested within this stream statement
 
@@ -31,27 +68,225 @@ class StreamStatement(ABC):
         """
         return []
 
+    def get_inputs(self) -> Sequence[Stream]:
+        """Get the streams that must be rendered before this statement
+
+        Returns:
+            list of input streams
+
+        """
+        return []
+
+    def get_operands(self) -> Sequence[Any]:
+        """Get the fields and other values rendered within this statement
+
+        Returns:
+            list of operands
+
+        """
+        return []
+
+    def _operands_static(self) -> bool:
+        """Whether every operand of this statement always renders to the same string
+
+        Subclasses with operands call this once at the end of their initializer to
+        decide whether the statement can be cached.
+
+        Returns:
+            True if all operands are static
+
+        """
+        for operand in self.get_operands():
+            if not is_static(operand):
+                return False
+
+        return True
+
+    def _cache_key(self) -> Any:
+        """Get a key that changes whenever the stream is renumbered
+
+        Returns:
+            stream reference
+
+        """
+        return self.stream.ref
+
+    def __str__(self) -> str:
+        """Cast this statement, preceded by any input streams, to a string"""
+        return render(self)
+
+    def _render_cached(self, buf: list) -> None:
+        """Render this statement into a buffer, reusing the last rendered string
+
+        The cached string is rebuilt whenever the stream is renumbered or a rendered
+        expression is changed in place. Statements with operands that are not static,
+        such as fields scoped to a stream or functions, are rendered every time.
+
+        Args:
+            buf: List of string fragments to append to
+
+        """
+        if not self._cacheable:
+            self._render(buf)
+            return
+
+        key = self._cache_key()
+        version = expression.render_version
+        if self._cached_key != key or self._cached_version != version:
+            parts: list = []
+            self._render(parts)
+            self._cached_str = "".join(parts)
+            self._cached_key = key
+            self._cached_version = version
+
+        buf.append(self._cached_str)
+
+    @abstractmethod
+    def _render(self, buf: list) -> None:
+        """Render this statement into a buffer
+
+        Input streams are not included. They are emitted separately by `render`.
+
+        Args:
+            buf: List of string fragments to append to
+
+        """
+        pass
+
 
 class Stream:
     """Base class for a SAQL data stream"""
 
+    __slots__ = (
+        "_id",
+        "_ref",
+        "_statements",
+        "_inputs",
+        "_cacheable",
+        "_version",
+        "_rendered_key",
+        "_rendered_str",
+        "_frozen",
+        "_frozen_inputs",
+    )
+
     _id: int
-    _statements: List[StreamStatement]
+    _ref: str
+    _statements: Union[List[StreamStatement], Tuple[StreamStatement, ...]]
+    _inputs: List[Stream]
+    _cacheable: bool
+    _version: int
+    _rendered_key: Optional[tuple]
+    _rendered_str: str
+    _frozen: bool
+    _frozen_inputs: Tuple[Tuple[Stream, str, int], ...]
 
     def __init__(self) -> None:
         """Initializer"""
         super().__init__()
+        self._frozen = False
+        self._frozen_inputs = ()
         self._id = 0
-        self._statements: List[StreamStatement] = []
+        self._ref = "q0"
+        self._statements = []
+        self._inputs = []
+        self._cacheable = True
+        self._version = 0
+        self._rendered_key = None
+        self._rendered_str = ""
 
     def __str__(self) -> str:
-        """Cast the stream to a string"""
-        return "\n".join(str(op) for op in self._statements)
+        """Cast the stream to a string
+
+        The rendered string is reused until a statement is added to this stream or
+        to any stream nested within it, any of those streams is renumbered, or an
+        operand of one of their statements changes. Streams with a statement that
+        cannot be cached are rendered every time. A frozen stream only checks that
+        the streams nested within it have not been changed or renumbered.
+        """
+        if self._frozen:
+            for stream, ref, version in self._frozen_inputs:
+                if stream._ref != ref or stream._version != version:
+                    self._frozen = False
+                    break
+            else:
+                return self._rendered_str
+
+        key = self._render_key()
+        if key is None:
+            return render(self)
+
+        if self._rendered_key != key:
+            self._rendered_str = render(self)
+            self._rendered_key = key
+
+        return self._rendered_str
+
+    def _render_key(self) -> Optional[tuple]:
+        """Get a key that changes whenever the rendered stream would change
+
+        Returns:
+            tuple of the expression render version and the reference and version of
+            this stream and every nested stream, or None if any statement cannot be
+            cached
+
+        """
+        if not self._cacheable:
+            return None
+
+        key: list = [expression.render_version]
+        stack = [self]
+        while stack:
+            stream = stack.pop()
+            if not stream._cacheable:
+                return None
+            key.append(stream._ref)
+            key.append(stream._version)
+            stack.extend(stream._inputs)
+
+        return tuple(key)
+
+    def _append(self, statement: StreamStatement) -> None:
+        """Append a statement and bump the stream version
+
+        The statement's input streams and whether it can be cached are recorded on
+        the stream so rendering can check them without visiting every statement.
+
+        Args:
+            statement: Stream statement
+
+        """
+        statements = self._statements
+        if isinstance(statements, tuple):
+            # Thaw a frozen stream's statements back into a list
+            statements = self._statements = list(statements)
+        statements.append(statement)
+        inputs = statement.get_inputs()
+        if inputs:
+            self._inputs.extend(inputs)
+        if not statement._cacheable:
+            self._cacheable = False
+        self._version += 1
+        self._frozen = False
 
     @property
     def ref(self) -> str:
         """Stream reference in the SAQL query"""
-        return f"q{self._id}"
+        return self._ref
+
+    def _set_id(self, id_: int) -> None:
+        """Set the stream ID and precompute its reference
+
+        Args:
+            id_: Stream ID
+
+        """
+        if id_ == self._id:
+            return
+
+        self._frozen = False
+        self._id = id_
+        self._ref = sys.intern(f"q{id_}")
 
     def get_streams(self) -> list[Stream]:
         """Get a flat list of streams nested within this stream
@@ -69,10 +304,12 @@ class Stream:
             statement: Stream statement
 
         """
-        self._statements.append(statement)
-        # Update all stream IDs
-        for i, s in enumerate(flatten(statement.get_streams())):
-            s._id = i
+        self._append(statement)
+        # Renumber all nested streams in post-order. A stream that is used more than
+        # once keeps the position of its first use so IDs stay contiguous.
+        streams = dict.fromkeys(flatten(statement.get_streams()))
+        for i, s in enumerate(streams):
+            s._set_id(i)
 
     def field(self, name: str) -> field:
         """Create a new field object scoped to this stream
@@ -98,7 +335,7 @@ class Stream:
             self
 
         """
-        self._statements.append(ProjectionStatement(self, fields))
+        self._append(ProjectionStatement(self, fields))
         return self
 
     def group(self, *fields: Scalar) -> Stream:
@@ -115,7 +352,7 @@ class Stream:
             self
 
         """
-        self._statements.append(GroupStatement(self, fields))
+        self._append(GroupStatement(self, fields))
         return self
 
     def filter(self, *filters: BinaryOperation) -> Stream:
@@ -129,7 +366,7 @@ class Stream:
             self
 
         """
-        self._statements.append(FilterStatement(self, filters))
+        self._append(FilterStatement(self, filters))
         return self
 
     def order(self, *fields: Union[Scalar, Tuple[Scalar, Order]]) -> Stream:
@@ -142,7 +379,7 @@ class Stream:
             self
 
         """
-        self._statements.append(OrderStatement(self, fields))
+        self._append(OrderStatement(self, fields))
         return self
 
     def limit(self, limit: int) -> Stream:
@@ -155,7 +392,11 @@ class Stream:
             self
 
         """
-        self._statements.append(LimitStatement(self, limit))
+        if limit <= 0 or limit > 10_000:
+            raise ValueError(
+                f"Limit must be a number between 1 and 10,000. Provided: {limit}"
+            )
+        self._append(LimitStatement(self, limit))
         return self
 
     def fill(
@@ -177,15 +418,44 @@ class Stream:
             self
 
         """
-        self._statements.append(
+        self._append(
             FillStatement(self, date_cols, date_type_string, partition=partition)
         )
         return self
 
+    def freeze(self) -> Stream:
+        """Render the stream once and reuse that string for every later cast
+
+        Use this for a pipeline that is built once and rendered many times. The
+        statements are also compacted into a tuple. Adding a statement to the stream
+        or to any stream nested within it, or renumbering any of them by passing it
+        to `cogroup` or `union`, thaws it again. The expressions used in statements,
+        including their aliases and window parameters, are assumed not to change
+        while the stream is frozen.
+
+        Returns:
+            self
+
+        """
+        self._statements = tuple(self._statements)
+        inputs = []
+        stack = list(self._inputs)
+        while stack:
+            stream = stack.pop()
+            inputs.append((stream, stream._ref, stream._version))
+            stack.extend(stream._inputs)
+        self._frozen_inputs = tuple(inputs)
+        self._rendered_str = render(self)
+        self._rendered_key = self._render_key()
+        self._frozen = True
+        return self
+
 
 class LoadStatement(StreamStatement):
     """Statement to load a dataset"""
 
+    __slots__ = ("name",)
+
     def __init__(self, stream: Stream, name: str) -> None:
         """Initializer
 
@@ -196,11 +466,15 @@ class LoadStatement(StreamStatement):
         """
         super().__init__()
         self.stream = stream
-        self.name = name
+        # Only exact str instances can be interned
+        self.name = sys.intern(name) if type(name) is str else name
 
-    def __str__(self) -> str:
-        """Cast this load statement to a string"""
-        return f'{self.stream.ref} = load "{self.name}";'
+    def _render(self, buf: list) -> None:
+        """Render this load statement into a buffer"""
+        buf.append(self.stream.ref)
+        buf.append(_LOAD)
+        buf.append(self.name)
+        buf.append('";')
 
     def get_streams(self) -> list[Stream]:
         """Get a flat list of streams nested within this stream statement
@@ -215,6 +489,8 @@ class LoadStatement(StreamStatement):
 class ProjectionStatement(StreamStatement):
     """Statement to project columns from a stream"""
 
+    __slots__ = ("fields",)
+
     def __init__(self, stream: Stream, fields: Sequence[Scalar]) -> None:
         """Initializer
 
@@ -228,16 +504,36 @@ class ProjectionStatement(StreamStatement):
         if not fields:
             raise ValueError("At least one field is required")
         self.fields = fields
+        self._cacheable = self._operands_static()
 
-    def __str__(self) -> str:
-        """Cast this projection statement to a string"""
-        fields = ", ".join(str(f) for f in self.fields)
-        return f"{self.stream.ref} = foreach {self.stream.ref} generate {fields};"
+    def get_operands(self) -> Sequence[Any]:
+        """Get the fields and other values rendered within this statement
+
+        Returns:
+            list of operands
+
+        """
+        return self.fields
+
+    def _render(self, buf: list) -> None:
+        """Render this projection statement into a buffer"""
+        ref = self.stream.ref
+        buf.append(ref)
+        buf.append(_FOREACH)
+        buf.append(ref)
+        buf.append(_GENERATE)
+        for i, f in enumerate(self.fields):
+            if i:
+                buf.append(_COMMA)
+            buf.append(str(f))
+        buf.append(_SEMI)
 
 
 class OrderStatement(StreamStatement):
     """Statement to order rows in a stream"""
 
+    __slots__ = ("fields", "_parts")
+
     def __init__(
         self,
         stream: Stream,
@@ -255,48 +551,75 @@ class OrderStatement(StreamStatement):
         if not fields:
             raise ValueError("At least one field is required")
         self.fields = fields
+        # Resolve the sort direction of each field once rather than on every render
+        self._parts: Tuple[Tuple[Scalar, str], ...] = tuple(
+            (f[0], f" {f[1]}") if isinstance(f, tuple) else (f, " asc") for f in fields
+        )
+        self._cacheable = self._operands_static()
 
-    def __str__(self) -> str:
-        """Cast this order statement to a string"""
-        fields = []
-        for f in self.fields:
-            if isinstance(f, Scalar):
-                fields.append(f"{f} asc")
-            else:
-                fields.append(f"{f[0]} {f[1]}")
+    def get_operands(self) -> Sequence[Any]:
+        """Get the fields and other values rendered within this statement
 
-        return (
-            f"{self.stream.ref} = order {self.stream.ref} by {stringify_list(fields)};"
-        )
+        Returns:
+            list of operands
+
+        """
+        return [f for (f, _) in self._parts]
+
+    def _render(self, buf: list) -> None:
+        """Render this order statement into a buffer"""
+        ref = self.stream.ref
+        buf.append(ref)
+        buf.append(_ORDER)
+        buf.append(ref)
+        buf.append(_BY)
+        multiple = len(self._parts) > 1
+        if multiple:
+            buf.append("(")
+        for i, (f, order) in enumerate(self._parts):
+            if i:
+                buf.append(_COMMA)
+            buf.append(str(f))
+            buf.append(order)
+        if multiple:
+            buf.append(")")
+        buf.append(_SEMI)
 
 
 class LimitStatement(StreamStatement):
     """Statement to limit the number of rows returned from a stream"""
 
+    __slots__ = ("limit",)
+
     def __init__(self, stream: Stream, limit: int):
         """Initializer
 
         Args:
             stream: Stream containing this statement
-            limit: Maximum number of rows to return. Max 10,000
+            limit: Maximum number of rows to return. This is validated by
+                `Stream.limit`.
 
         """
         super().__init__()
         self.stream = stream
-        if limit <= 0 or limit > 10_000:
-            raise ValueError(
-                f"Limit must be a number between 1 and 10,000. Provided: {limit}"
-            )
         self.limit = limit
 
-    def __str__(self) -> str:
-        """Cast this limit statement to a string"""
-        return f"{self.stream.ref} = limit {self.stream.ref} {self.limit};"
+    def _render(self, buf: list) -> None:
+        """Render this limit statement into a buffer"""
+        ref = self.stream.ref
+        buf.append(ref)
+        buf.append(_LIMIT)
+        buf.append(ref)
+        buf.append(" ")
+        buf.append(str(self.limit))
+        buf.append(_SEMI)
 
 
 class GroupStatement(StreamStatement):
     """Statement to group rows in a stream"""
 
+    __slots__ = ("fields",)
+
     def __init__(self, stream: Stream, fields: Sequence[Scalar]):
         """Initializer
 
@@ -309,16 +632,43 @@ class GroupStatement(StreamStatement):
         super().__init__()
         self.stream = stream
         self.fields = fields
+        self._cacheable = self._operands_static()
 
-    def __str__(self) -> str:
-        """Cast this group statement to a string"""
-        fields = stringify_list(self.fields) if self.fields else "all"
-        return f"{self.stream.ref} = group {self.stream.ref} by {fields};"
+    def get_operands(self) -> Sequence[Any]:
+        """Get the fields and other values rendered within this statement
+
+        Returns:
+            list of operands
+
+        """
+        return self.fields
+
+    def _render(self, buf: list) -> None:
+        """Render this group statement into a buffer"""
+        ref = self.stream.ref
+        buf.append(ref)
+        buf.append(_GROUP)
+        buf.append(ref)
+        buf.append(_BY)
+        if not self.fields:
+            buf.append("all")
+        elif len(self.fields) == 1:
+            buf.append(str(self.fields[0]))
+        else:
+            buf.append("(")
+            for i, f in enumerate(self.fields):
+                if i:
+                    buf.append(_COMMA)
+                buf.append(str(f))
+            buf.append(")")
+        buf.append(_SEMI)
 
 
 class FilterStatement(StreamStatement):
     """Statement to filter rows in a stream"""
 
+    __slots__ = ("filters", "_expr")
+
     def __init__(self, stream: Stream, filters: Sequence[BinaryOperation]) -> None:
         """Initializer
 
@@ -332,19 +682,35 @@ class FilterStatement(StreamStatement):
         if not filters:
             raise ValueError("At least one filter is required")
         self.filters = filters
+        # A single predicate, the common case, is rendered as-is
+        self._expr = filters[0] if len(filters) == 1 else Conjunction(filters)
+        self._cacheable = self._operands_static()
 
-    def __str__(self) -> str:
-        """Cast this filter statement to a string"""
-        expr = functools.reduce(
-            lambda left, right: BinaryOperation(operator.and_, left, right),
-            self.filters,
-        )
-        return f"{self.stream.ref} = filter {self.stream.ref} by {expr};"
+    def get_operands(self) -> Sequence[Any]:
+        """Get the fields and other values rendered within this statement
+
+        Returns:
+            list of operands
+
+        """
+        return [self._expr]
+
+    def _render(self, buf: list) -> None:
+        """Render this filter statement into a buffer"""
+        ref = self.stream.ref
+        buf.append(ref)
+        buf.append(_FILTER)
+        buf.append(ref)
+        buf.append(_BY)
+        buf.append(str(self._expr))
+        buf.append(_SEMI)
 
 
 class CogroupStatement(StreamStatement):
     """Statement to combine (join) two or more streams into one"""
 
+    __slots__ = ("streams", "join_type")
+
     def __init__(
         self,
         stream: Stream,
@@ -369,10 +735,44 @@ class CogroupStatement(StreamStatement):
             raise ValueError("At least one stream is required")
         self.streams = streams
         self.join_type = join_type
+        self._cacheable = self._operands_static()
 
-    def __str__(self) -> str:
-        """Cast this cogroup statement to a string"""
-        lines = []
+    def get_inputs(self) -> Sequence[Stream]:
+        """Get the streams that must be rendered before this statement
+
+        Returns:
+            list of input streams
+
+        """
+        return [stream for (stream, _) in self.streams]
+
+    def _cache_key(self) -> Any:
+        """Get a key that changes whenever this or an input stream is renumbered
+
+        Returns:
+            tuple of the stream and input stream references
+
+        """
+        return (self.stream.ref, *[stream.ref for (stream, _) in self.streams])
+
+    def get_operands(self) -> Sequence[Any]:
+        """Get the fields and other values rendered within this statement
+
+        Returns:
+            list of operands
+
+        """
+        operands: list = []
+        for (_, field_) in self.streams:
+            if isinstance(field_, Sequence) and not isinstance(field_, str):
+                operands.extend(field_)
+            else:
+                operands.append(field_)
+
+        return operands
+
+    def _render(self, buf: list) -> None:
+        """Render this cogroup statement into a buffer"""
         streams = []
         for i, item in enumerate(self.streams):
             stream, field_ = item
@@ -392,11 +792,11 @@ class CogroupStatement(StreamStatement):
                 s += f" {self.join_type}"
 
             streams.append(s)
-            lines.append(str(stream))
-
-        lines.append(f"{self.stream.ref} = cogroup {', '.join(streams)};")
 
-        return "\n".join(lines)
+        buf.append(self.stream.ref)
+        buf.append(_COGROUP)
+        buf.append(_COMMA.join(streams))
+        buf.append(_SEMI)
 
     def get_streams(self) -> list[Stream]:
         """Get a flat list of streams nested within this stream statement
@@ -416,6 +816,8 @@ class CogroupStatement(StreamStatement):
 class UnionStatement(StreamStatement):
     """Statement to combine (union) two or more streams with the same structure into one"""
 
+    __slots__ = ("streams",)
+
     def __init__(
         self,
         stream: Stream,
@@ -434,17 +836,30 @@ class UnionStatement(StreamStatement):
             raise ValueError("At least two streams are required")
         self.streams = streams
 
-    def __str__(self) -> str:
-        """Cast this union statement to a string"""
-        lines = []
-        stream_refs = []
+    def get_inputs(self) -> Sequence[Stream]:
+        """Get the streams that must be rendered before this statement
 
-        for stream in self.streams:
-            lines.append(str(stream))
-            stream_refs.append(stream.ref)
+        Returns:
+            list of input streams
 
-        lines.append(f"{self.stream.ref} = union {', '.join(stream_refs)};")
-        return "\n".join(lines)
+        """
+        return self.streams
+
+    def _cache_key(self) -> Any:
+        """Get a key that changes whenever this or an input stream is renumbered
+
+        Returns:
+            tuple of the stream and input stream references
+
+        """
+        return (self.stream.ref, *[stream.ref for stream in self.streams])
+
+    def _render(self, buf: list) -> None:
+        """Render this union statement into a buffer"""
+        buf.append(self.stream.ref)
+        buf.append(_UNION)
+        buf.append(_COMMA.join([stream.ref for stream in self.streams]))
+        buf.append(_SEMI)
 
     def get_streams(self) -> list[Stream]:
         """Get a flat list of streams nested within this stream statement
@@ -459,6 +874,8 @@ class UnionStatement(StreamStatement):
 class FillStatement(StreamStatement):
     """Statement to fill a data stream with missing dates"""
 
+    __slots__ = ("date_cols", "date_type_string", "partition")
+
     def __init__(
         self,
         stream: Stream,
@@ -482,16 +899,84 @@ class FillStatement(StreamStatement):
         self.date_cols = date_cols
         self.date_type_string = date_type_string
         self.partition = partition
+        self._cacheable = self._operands_static()
 
-    def __str__(self) -> str:
-        """Cast this fill statement to a string"""
-        args = [
-            f"dateCols=({', '.join(str(c) for c in self.date_cols)}, {stringify(str(self.date_type_string))})"
-        ]
+    def get_operands(self) -> Sequence[Any]:
+        """Get the fields and other values rendered within this statement
+
+        Returns:
+            list of operands
+
+        """
+        return [*self.date_cols, self.partition]
+
+    def _render(self, buf: list) -> None:
+        """Render this fill statement into a buffer"""
+        ref = self.stream.ref
+        buf.append(ref)
+        buf.append(_FILL)
+        buf.append(ref)
+        buf.append(_BY)
+        buf.append("(dateCols=(")
+        for c in self.date_cols:
+            buf.append(str(c))
+            buf.append(_COMMA)
+        buf.append(stringify(str(self.date_type_string)))
+        buf.append(")")
         if self.partition:
-            args.append(f"partition={stringify(self.partition)}")
+            buf.append(", partition=")
+            buf.append(stringify(self.partition))
+        buf.append(");")
+
+
+def _push_statement(stack: list, statement: StreamStatement) -> None:
+    """Push a statement onto the render stack so it is emitted after its inputs
+
+    Args:
+        stack: Render stack of strings, streams and statement render callbacks
+        statement: Stream statement
 
-        return f"{self.stream.ref} = fill {self.stream.ref} by ({', '.join(args)});"
+    """
+    stack.append(statement._render_cached)
+    for stream in reversed(statement.get_inputs()):
+        stack.append(_NL)
+        stack.append(stream)
+
+
+def render(root: Union[Stream, StreamStatement]) -> str:
+    """Render a stream or statement to a SAQL string
+
+    Nested streams are walked with an explicit stack rather than recursion, so each
+    statement is visited once and written to a single buffer regardless of how
+    deeply cogroups and unions are nested.
+
+    Args:
+        root: Stream or statement to render
+
+    Returns:
+        SAQL string
+
+    """
+    buf: list = []
+    stack: list = []
+    if isinstance(root, Stream):
+        stack.append(root)
+    else:
+        _push_statement(stack, root)
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            buf.append(item)
+        elif isinstance(item, Stream):
+            statements = item._statements
+            for i in range(len(statements) - 1, -1, -1):
+                _push_statement(stack, statements[i])
+                if i:
+                    stack.append(_NL)
+        else:
+            item(buf)
+
+    return "".join(buf)
 
 
 def load(name: str) -> Stream:
@@ -64,7 +64,7 @@ def stringify_list(seq: Sequence) -> str:
 
     """
     seq = [seq] if not isinstance(seq, (list, tuple, set)) else seq
-    return f"({', '.join(str(s) for s in seq)})" if len(seq) > 1 else str(seq[0])
+    return f"({', '.join([str(s) for s in seq])})" if len(seq) > 1 else str(seq[0])
 
 
 def flatten(seq: list) -> list:
@@ -77,8 +77,15 @@ def flatten(seq: list) -> list:
         flatten list of items
 
     """
-    if not seq:
-        return seq
-    if isinstance(seq[0], list):
-        return flatten(seq[0]) + flatten(seq[1:])
-    return seq[:1] + flatten(seq[1:])
+    flat = []
+    stack = [iter(seq)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list):
+                stack.append(iter(item))
+                break
+            flat.append(item)
+        else:
+            stack.pop()
+
+    return flat
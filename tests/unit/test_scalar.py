@@ -1,7 +1,9 @@
 """Contains unit tests for the scalar module"""
 
 
-from pysaql.scalar import field, literal
+import operator
+
+from pysaql.scalar import BinaryOperation, Conjunction, field, literal
 
 
 def test_alias():
@@ -9,6 +11,29 @@ def test_alias():
     assert str(field("name").alias("NAME")) == "'name' as 'NAME'"
 
 
+def test_alias__cached():
+    """Should discard the cached string when the alias changes"""
+    f = field("name")
+    assert str(f) == "'name'"
+    assert str(f.alias("NAME")) == "'name' as 'NAME'"
+
+
+def test_with_alias():
+    """Should alias a copy and leave the original expression unchanged"""
+    f = field("name")
+    assert str(f.with_alias("NAME")) == "'name' as 'NAME'"
+    assert str(f.with_alias("OTHER")) == "'name' as 'OTHER'"
+    assert str(f) == "'name'"
+
+
+def test_wrap__cached():
+    """Should discard the cached string when the operation becomes an operand"""
+    op = field("foo") == "bar"
+    assert str(op) == """'foo' == \"bar\""""
+    op & field("baz")
+    assert str(op) == """('foo' == "bar")"""
+
+
 def test_eq():
     """Should return string for eq operation"""
     assert str(field("foo") == "bar") == """'foo' == \"bar\""""
@@ -98,3 +123,19 @@ def test_or():
 def test_inv():
     """Should return string for inv operation"""
     assert str(~field("foo")) == """! 'foo'"""
+
+
+def test_conjunction():
+    """Should render the same string as a left fold of binary operations"""
+    operands = [field("a") == 1, ~field("b"), field("c") > 2]
+    assert (
+        str(Conjunction(operands))
+        == """(('a' == 1) && ! 'b') && ('c' > 2)"""
+        == str(
+            BinaryOperation(
+                operator.and_,
+                BinaryOperation(operator.and_, *operands[:2]),
+                operands[2],
+            )
+        )
+    )
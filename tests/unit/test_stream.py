@@ -2,9 +2,10 @@
 
 import pytest
 
+from pysaql import aggregation
 from pysaql.enums import FillDateTypeString, JoinType, Order
 from pysaql.scalar import field
-from pysaql.stream import cogroup, load, Stream, union
+from pysaql.stream import cogroup, load, render, Stream, union
 
 
 def test_load():
@@ -46,6 +47,95 @@ def test_cogroup():
     ]
 
 
+def test_cogroup__rendered():
+    """Should re-render a stream after it is renumbered by a cogroup"""
+    q0 = load("q0_dataset")
+    q1 = load("q1_dataset").limit(5)
+    assert str(q1).split("\n") == [
+        """q0 = load "q1_dataset";""",
+        """q0 = limit q0 5;""",
+    ]
+
+    c0 = cogroup((q0, "all"), (q1, "all"))
+    assert str(c0).split("\n") == [
+        """q0 = load "q0_dataset";""",
+        """q1 = load "q1_dataset";""",
+        """q1 = limit q1 5;""",
+        """q2 = cogroup q0 by all, q1 by all;""",
+    ]
+
+
+def test_cogroup__nested_mutation():
+    """Should re-render a cogroup after one of its input streams changes"""
+    q0 = load("q0_dataset")
+    q1 = load("q1_dataset")
+    c0 = cogroup((q0, "all"), (q1, "all"))
+    assert str(c0) == str(c0)
+
+    q1.limit(5)
+    assert str(c0).split("\n") == [
+        """q0 = load "q0_dataset";""",
+        """q1 = load "q1_dataset";""",
+        """q1 = limit q1 5;""",
+        """q2 = cogroup q0 by all, q1 by all;""",
+    ]
+
+
+def test_cogroup__nested_uncacheable():
+    """Should stop caching a cogroup once an input gains an uncacheable statement"""
+    q0 = load("q0_dataset")
+    q1 = load("q1_dataset")
+    c0 = cogroup((q0, "all"), (q1, "all"))
+    assert c0._render_key() is not None
+
+    q1.foreach(q1.field("a"))
+    assert c0._render_key() is None
+    assert str(c0).split("\n")[2] == """q1 = foreach q1 generate q1.'a';"""
+
+
+def test_cogroup__repeated_stream():
+    """Should assign contiguous IDs when a stream is used more than once"""
+    q0 = load("q0_dataset")
+    c0 = cogroup((q0, field("a")), (q0, field("b")))
+    assert str(c0).split("\n") == [
+        """q0 = load "q0_dataset";""",
+        """q0 = load "q0_dataset";""",
+        """q1 = cogroup q0 by 'a', q0 by 'b';""",
+    ]
+
+
+def test_cogroup__many():
+    """Should renumber a large number of streams"""
+    streams = [load(f"q{i}_dataset") for i in range(2000)]
+    c0 = cogroup(*[(s, "all") for s in streams])
+    assert c0.ref == "q2000"
+    assert str(c0).split("\n")[-2] == """q1999 = load "q1999_dataset";"""
+
+
+def test_cogroup__input_renumbered():
+    """Should re-render a cogroup after one of its inputs is renumbered"""
+    a = load("a")
+    b = load("b")
+    c = cogroup((a, "all"), (b, "all"))
+    str(c)
+    cogroup((cogroup((load("y1"), "all"), (load("y2"), "all")), "all"), (b, "all"))
+    assert str(c).split("\n") == [
+        """q0 = load "a";""",
+        """q3 = load "b";""",
+        """q2 = cogroup q0 by all, q3 by all;""",
+    ]
+
+
+def test_foreach__scoped_renumbered():
+    """Should re-render scoped fields after their stream is renumbered"""
+    a = load("a")
+    b = load("b")
+    c = cogroup((a, "all"), (b, "all")).foreach(b.field("x"))
+    str(c)
+    cogroup((cogroup((load("y1"), "all"), (load("y2"), "all")), "all"), (b, "all"))
+    assert str(c).split("\n")[-1] == """q2 = foreach q2 generate q3.'x';"""
+
+
 def test_cogroup__all():
     """Should cogroup by all"""
 
@@ -104,6 +194,74 @@ def test_foreach__cogroup():
     ]
 
 
+def test_foreach__alias_after_add():
+    """Should render aliases set after the field was added"""
+    f = aggregation.sum(field("x"))
+    g = field("y")
+    q0 = load("q0_dataset").foreach(f, g)
+    render(q0)
+    f.alias("total")
+    g.alias("why")
+    assert (
+        render(q0).split("\n")[-1]
+        == """q0 = foreach q0 generate sum('x') as 'total', 'y' as 'why';"""
+    )
+
+
+def test_foreach__over_after_add():
+    """Should render window parameters set after the function was added"""
+    f = aggregation.sum(field("x"))
+    q0 = load("q0_dataset").foreach(f)
+    render(q0)
+    f.over((None, 2), [field("r")], [field("r")])
+    assert (
+        render(q0).split("\n")[-1]
+        == """q0 = foreach q0 generate sum('x') over ([..2] partition by 'r' order by 'r' asc);"""
+    )
+
+
+def test_foreach__wrap_after_add():
+    """Should render parentheses added after the operation was added"""
+    op = field("a") == 1
+    q0 = load("q0_dataset").foreach(op)
+    render(q0)
+    op & field("b")
+    assert render(q0).split("\n")[-1] == """q0 = foreach q0 generate ('a' == 1);"""
+
+
+def test_foreach__mutated_after_render():
+    """Should re-render a stream after an expression in it changes"""
+    f = aggregation.sum(field("x"))
+    g = field("y")
+    q0 = load("q0_dataset").foreach(f, g)
+    str(q0)
+    f.alias("total")
+    f.over((None, 2), [field("r")], [field("r")])
+    g.alias("why")
+    assert str(q0).split("\n")[-1] == (
+        "q0 = foreach q0 generate sum('x') over ([..2] partition by 'r' order by"
+        " 'r' asc) as 'total', 'y' as 'why';"
+    )
+
+
+def test_foreach__cacheable():
+    """Should only cache statements whose operands are all static"""
+    q0 = load("q0_dataset").foreach(field("a"))
+    q1 = load("q1_dataset")
+    q1.foreach(q1.field("a"))
+    assert q0._statements[-1]._cacheable
+    assert not q1._statements[-1]._cacheable
+
+
+def test_group__alias_after_render():
+    """Should re-render a cached stream after a static field is aliased"""
+    g = field("y")
+    q0 = load("q0_dataset").group(g)
+    assert str(q0) == str(q0)
+    g.alias("why")
+    assert str(q0).split("\n")[-1] == """q0 = group q0 by 'y' as 'why';"""
+
+
 def test_group__all():
     """Should group by all when no fields are provided"""
     stream = Stream()
@@ -178,6 +336,24 @@ def test_order():
     ]
 
 
+def test_order__scoped():
+    """Should order by fields scoped to a renumbered stream"""
+    q0 = load("q0_dataset")
+    q1 = load("q1_dataset")
+    c0 = cogroup((q0, "all"), (q1, "all"))
+    c0.order((q1.field("name"), Order.desc))
+    assert str(c0).split("\n")[-1] == """q2 = order q2 by q1.'name' desc;"""
+
+
+def test_order__alias_after_add():
+    """Should render aliases set after the field was added"""
+    f = field("name")
+    stream = Stream()
+    stream.order(f)
+    f.alias("n")
+    assert str(stream) == """q0 = order q0 by 'name' as 'n' asc;"""
+
+
 def test_fill__no_partition():
     """Should include fill statement without a partition"""
     stream = Stream()
@@ -202,6 +378,27 @@ def test_fill__partition():
     )
 
 
+def test_fill__scoped():
+    """Should fill by fields scoped to a renumbered stream"""
+    q0 = load("q0_dataset")
+    q1 = load("q1_dataset")
+    c0 = cogroup((q0, "all"), (q1, "all"))
+    c0.fill([q1.field("Year")], FillDateTypeString.y, partition=q0.field("Type"))
+    assert (
+        str(c0).split("\n")[-1]
+        == """q2 = fill q2 by (dateCols=(q1.'Year', "Y"), partition=q0.'Type');"""
+    )
+
+
+def test_fill__alias_after_add():
+    """Should render aliases set after the date field was added"""
+    year = field("Year")
+    stream = Stream()
+    stream.fill([year], FillDateTypeString.y)
+    year.alias("Y")
+    assert str(stream) == """q0 = fill q0 by (dateCols=('Year' as 'Y', "Y"));"""
+
+
 def test_union():
     """Should return a unioned stream"""
 
@@ -234,3 +431,81 @@ def test_union__one_streams():
     with pytest.raises(ValueError):
         q0 = load("q0_dataset")
         union(q0)
+
+
+def test_freeze():
+    """Should reuse the frozen string until the stream changes"""
+    q0 = load("q0_dataset").freeze()
+    assert isinstance(q0._statements, tuple)
+    assert str(q0) == """q0 = load "q0_dataset";"""
+
+    q0.limit(5)
+    assert isinstance(q0._statements, list)
+    assert not q0._frozen
+
+    q0.freeze()
+    assert str(q0).split("\n") == [
+        """q0 = load "q0_dataset";""",
+        """q0 = limit q0 5;""",
+    ]
+
+    q1 = load("q1_dataset").freeze()
+    cogroup((q0, "all"), (q1, "all"))
+    assert str(q1) == """q1 = load "q1_dataset";"""
+
+
+def test_freeze__input_mutation():
+    """Should re-render a frozen cogroup after one of its inputs changes"""
+    a = load("a")
+    b = load("b")
+    c = cogroup((a, "all"), (b, "all")).freeze()
+    b.limit(3)
+    assert str(c).split("\n") == [
+        """q0 = load "a";""",
+        """q1 = load "b";""",
+        """q1 = limit q1 3;""",
+        """q2 = cogroup q0 by all, q1 by all;""",
+    ]
+
+
+def test_freeze__input_renumbered():
+    """Should re-render a frozen cogroup after one of its inputs is renumbered"""
+    a = load("a")
+    b = load("b")
+    c = cogroup((a, "all"), (b, "all")).freeze()
+    cogroup((cogroup((load("y1"), "all"), (load("y2"), "all")), "all"), (b, "all"))
+    assert str(c).split("\n") == [
+        """q0 = load "a";""",
+        """q3 = load "b";""",
+        """q2 = cogroup q0 by all, q3 by all;""",
+    ]
+
+
+def test_plain_string_fields():
+    """Should render plain strings passed in place of fields"""
+    stream = Stream()
+    stream.foreach("'name'")
+    stream.group("'name'")
+    stream.order(("'name'", Order.desc))
+    stream.fill(["'Year'"], FillDateTypeString.y, partition="Type")
+    stream.filter("'name' == \"foo\"")
+    assert str(stream).split("\n") == [
+        """q0 = foreach q0 generate 'name';""",
+        """q0 = group q0 by 'name';""",
+        """q0 = order q0 by 'name' desc;""",
+        """q0 = fill q0 by (dateCols=('Year', "Y"), partition="Type");""",
+        """q0 = filter q0 by 'name' == "foo";""",
+    ]
+
+
+def test_str_subclass_names():
+    """Should accept str subclasses as dataset and field names"""
+
+    class Name(str):
+        pass
+
+    stream = load(Name("foo")).foreach(field(Name("name")))
+    assert str(stream).split("\n") == [
+        """q0 = load "foo";""",
+        """q0 = foreach q0 generate 'name';""",
+    ]